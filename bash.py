@@ -1,168 +1,1143 @@
 from __future__ import annotations
 
+import errno
+import glob
 import json
+import os
+import pty
+import re
+import select
+import shlex
+import shutil
+import sqlite3
+import stat
 import subprocess
 import sys
-from typing import Any, Dict, List, Optional
+import threading
+import time
+import tty
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 CommandResult = Dict[str, Any]
+# Column-oriented `du` rows: {"paths": [...], "size_humans": [...],
+# "size_bytes": array("q"), "size_missing": bytearray}. `size_missing` is 1
+# where the size token could not be converted (stored as 0 in `size_bytes`);
+# serialize with `json_default`.
+SizeColumns = Dict[str, Any]
 DEFAULT_TIMEOUT_SECONDS = 200
+# The home directory is fixed for the life of the process, so `~` paths are
+# expanded against this once instead of consulting HOME/pwd on every scan.
+_HOME = os.path.expanduser("~")
+# Scans spend nearly all of their time blocked on `du`/`find`/`diskutil`, so
+# threads (not processes) are enough to overlap them.
+MAX_SCAN_WORKERS = 32
+# Per-command budgets replacing DEFAULT_TIMEOUT_SECONDS where the cost is
+# known: metadata queries answer almost instantly, so a hang is cut short,
+# while whole-disk walks legitimately take minutes on large volumes.
+FAST_TIMEOUT_SECONDS = 10
+DISK_WALK_TIMEOUT_SECONDS = 600
+# Results of slow scans are kept on disk so repeat page loads skip the `du`
+# walks. Scans missing from the TTL table (fast or fast-changing) always run.
+SCAN_CACHE_PATH = os.path.join(_HOME, "Library/Caches/mac-cleaner/scan-cache.db")
+# Bump when the stored result shape changes; older caches are dropped on open.
+SCAN_CACHE_VERSION = 2
+SCAN_CACHE_TTL_SECONDS = {
+    "cache_search": 10 * 60,
+    "dev_data_search": 60 * 60,
+    "homebrew_search": 10 * 60,
+    "venv_search": 10 * 60,
+    "docker_search": 10 * 60,
+    "backup_search": 60 * 60,
+    "photo_cache_serch": 60 * 60,
+    "imove_search": 60 * 60,
+    "universal_search": 10 * 60,
+}
+# Scans that accept an `on_partial` callback and report output while their
+# long-running commands are still going. Partial output is flushed every
+# PARTIAL_BATCH_LINES lines or PARTIAL_INTERVAL_SECONDS, whichever is first.
+PARTIAL_SCANS = frozenset({"universal_search"})
+PARTIAL_BATCH_LINES = 50
+PARTIAL_INTERVAL_SECONDS = 1.0
 
-# Ordered list of scan functions for CLI and server streaming.
-SCAN_FUNCTIONS = [
-    "snapshots_search",
-    "apfs_search",
-    "vm_search",
-    "sleep_search",
-    "cache_search",
-    "dev_data_search",
-    "homebrew_search",
-    "venv_search",
-    "docker_search",
-    "backup_search",
-    "photo_cache_serch",
-    "imove_search",
-    "purgeable_search",
-    "universal_search",
-]
-
-def _human_to_bytes(token: str) -> Optional[int]:
-    """Convert a human-friendly size token (e.g., '12G', '512M') to bytes."""
-    multipliers = {
-        "k": 1024,
-        "m": 1024**2,
-        "g": 1024**3,
-        "t": 1024**4,
-        "p": 1024**5,
-    }
-    token = token.strip()
-    if not token:
+
+# One pass over a raw `du` line: size token (number + unit), separator, path.
+_DU_LINE_RE = re.compile(rb"\s*(([0-9]*\.?[0-9]+)([A-Za-z]*))\s+(.*\S)")
+_SIZE_MULTIPLIERS = {
+    "": 1,
+    "b": 1,
+    "k": 1024,
+    "m": 1024**2,
+    "g": 1024**3,
+    "t": 1024**4,
+    "p": 1024**5,
+}
+
+
+_SIZE_MULTIPLIERS_B = {unit.encode("ascii"): value for unit, value in _SIZE_MULTIPLIERS.items()}
+_UNIT_LETTERS_B = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+
+@lru_cache(maxsize=None)
+def _expand_user(path: str) -> str:
+    """Memoized `os.path.expanduser` for the current user's `~` paths."""
+    if path == "~":
+        return _HOME
+    if path.startswith("~/"):
+        return _HOME + path[1:]
+    return os.path.expanduser(path)
+
+
+_WHICH_CACHE: Dict[str, str] = {}
+
+
+def _which(name: str) -> Optional[str]:
+    """
+    `shutil.which` with successful lookups cached. Misses are not cached, so
+    a tool installed while the server is running is found on the next scan.
+    """
+    path = _WHICH_CACHE.get(name)
+    if path is None:
+        path = shutil.which(name)
+        if path is not None:
+            _WHICH_CACHE[name] = path
+    return path
+
+
+def _decode_output(data: bytes) -> str:
+    """Decode command output for display, replacing bytes that are not UTF-8."""
+    return data.decode("utf-8", errors="replace")
+
+
+def _decode_path(data: bytes) -> str:
+    """Decode a filesystem path losslessly; non-UTF-8 bytes become surrogate escapes."""
+    return data.decode("utf-8", errors="surrogateescape")
+
+
+def _bytes_to_human(size: int) -> str:
+    """Format a byte count the way `du -h` does (e.g., 4.0K, 512M, 12G)."""
+    value = float(size)
+    for unit in "BKMGT":
+        if value < 1024:
+            break
+        value /= 1024
+    else:
+        unit = "P"
+    if unit == "B":
+        return f"{size}B"
+    return f"{value:.1f}{unit}" if value < 10 else f"{value:.0f}{unit}"
+
+
+def _empty_sizes() -> SizeColumns:
+    """Return an empty `parsed_sizes` column set."""
+    return {"paths": [], "size_humans": [], "size_bytes": array("q"), "size_missing": bytearray()}
+
+
+def _size_appender(parsed: SizeColumns) -> Callable[[str, str, Optional[int]], None]:
+    """
+    Return `append(path, size_human, size_bytes)` adding one row to `parsed`
+    and flagging sizes that could not be determined. The column appends are
+    bound once, so building many rows skips the per-row dict lookups.
+    """
+    add_path = parsed["paths"].append
+    add_human = parsed["size_humans"].append
+    add_bytes = parsed["size_bytes"].append
+    add_missing = parsed["size_missing"].append
+
+    def append(path: str, size_human: str, size_bytes: Optional[int]) -> None:
+        add_path(path)
+        add_human(size_human)
+        add_bytes(size_bytes or 0)
+        add_missing(size_bytes is None)
+
+    return append
+
+
+@lru_cache(maxsize=2048)
+def _du_size_token(token: bytes) -> Optional[Tuple[str, Optional[int]]]:
+    """
+    Convert a raw `du -h` size token (e.g. b'4.0K') to `(size_human, size_bytes)`,
+    or None when it is not numeric. du output repeats a small set of tokens
+    (`0B`, `4.0K`, ...), so conversions are memoized. Plain integer tokens
+    skip the float parse, so counts above 2**53 stay exact.
+    """
+    if token.isdigit():
+        return token.decode("ascii"), int(token)
+    number = token.rstrip(_UNIT_LETTERS_B)
+    if not number.replace(b".", b"", 1).isdigit():
         return None
+    multiplier = _SIZE_MULTIPLIERS_B.get(token[len(number) : len(number) + 1].lower())
+    size_bytes = None if multiplier is None else int(float(number) * multiplier)
+    return token.decode("ascii"), size_bytes
 
-    number = ""
-    unit = ""
-    for char in token:
-        if char.isdigit() or char == ".":
-            number += char
-        else:
-            unit += char
-    if not number:
+
+def _parse_du_line(line: bytes) -> Optional[Tuple[str, Optional[int], str]]:
+    """
+    Split one raw `du` line into `(size_human, size_bytes, path)`, or None when
+    it has no path. Lines whose size token is not numeric report an unknown size.
+    """
+    size_human, sep, path = line.partition(b"\t")
+    if sep:
+        path = path.rstrip()
+        size = _du_size_token(size_human) if path else None
+        if size is not None:
+            return size[0], size[1], _decode_path(path)
+    match = _DU_LINE_RE.match(line)
+    if match is not None:
+        size_human, number, unit, path = match.groups()
+        multiplier = _SIZE_MULTIPLIERS_B.get(unit[:1].lower())
+        size_bytes = None if multiplier is None else int(float(number) * multiplier)
+        return size_human.decode("ascii"), size_bytes, _decode_path(path)
+    parts = line.split(None, 1)
+    if len(parts) < 2:
         return None
+    size_human, path = parts
+    return _decode_output(size_human), None, _decode_path(path.strip())
+
+
+def _append_du_rows(parsed: SizeColumns, lines: Iterable[bytes]) -> None:
+    """Parse `du` output lines into `parsed`, ignoring lines without a path."""
+    append = _size_appender(parsed)
+    for line in lines:
+        row = _parse_du_line(line)
+        if row is not None:
+            size_human, size_bytes, path = row
+            append(path, size_human, size_bytes)
+
 
+def json_default(obj: Any) -> Any:
+    """`json.dumps`/`orjson.dumps` hook that expands packed size columns into plain lists."""
+    if isinstance(obj, array):
+        return obj.tolist()
+    if isinstance(obj, bytearray):
+        return [bool(flag) for flag in obj]
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def dumps(item: CommandResult) -> bytes:
+    """Encode one result as compact JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(item, default=json_default)
+        except orjson.JSONEncodeError:
+            # orjson rejects the surrogate escapes used for non-UTF-8 paths;
+            # the stdlib encoder writes them as \\udcXX escapes instead.
+            pass
+    return json.dumps(item, separators=(",", ":"), default=json_default).encode("utf-8")
+
+
+def _error_result(
+    command: str,
+    exc: Exception,
+    *,
+    category: str,
+    path: Optional[str],
+    note: Optional[str],
+) -> CommandResult:
+    """Build the result reported when a command could not be executed at all."""
+    return {
+        "category": category,
+        "command": command,
+        "stdout": "",
+        "stderr": f"Internal execution error: {exc}",
+        "returncode": -1,
+        "path": path,
+        "note": note,
+        "parsed_sizes": None,
+        "status": "error",
+    }
+
+
+def _timeout_result(
+    command: str,
+    timeout: float,
+    *,
+    category: str,
+    path: Optional[str],
+    note: Optional[str],
+) -> CommandResult:
+    """Build the result reported when in-process work runs past its deadline."""
+    return {
+        "category": category,
+        "command": command,
+        "stdout": "",
+        "stderr": f"Timed out after {timeout} seconds.",
+        "returncode": -1,
+        "path": path,
+        "note": note,
+        "parsed_sizes": None,
+        "status": "error",
+    }
+
+
+def _read_plain(stream: IO[bytes]) -> Tuple[str, None]:
+    """Read a command's whole stdout; non-`du` results carry no parsed sizes."""
+    return _decode_output(stream.read()), None
+
+
+def _read_du(stream: IO[bytes]) -> Tuple[str, SizeColumns]:
+    """
+    Read raw `du` output and parse its rows from the bytes; the text is decoded
+    once for display. Reading in one call and splitting afterwards is cheaper
+    than iterating the pipe line by line, and parsing is negligible next to
+    the walk itself.
+    """
+    data = stream.read()
+    parsed = _empty_sizes()
+    _append_du_rows(parsed, data.splitlines())
+    return _decode_output(data), parsed
+
+
+def _read_chunk(fd: int) -> bytes:
+    """Read whatever is available on `fd`; a pty reports EOF as EIO, returned as b""."""
     try:
-        value = float(number)
-    except ValueError:
-        return None
+        return os.read(fd, 65536)
+    except OSError as exc:
+        if exc.errno == errno.EIO:
+            return b""
+        raise
 
-    unit = unit.lower()
-    if not unit:
-        return int(value)
 
-    normalized = unit[0]
-    multiplier = multipliers.get(normalized)
-    if multiplier is None:
-        return None
-    return int(value * multiplier)
+def _partial_reader(
+    emit: Callable[[str], None],
+    batch_lines: int = PARTIAL_BATCH_LINES,
+) -> Callable[[IO[bytes]], Tuple[str, None]]:
+    """
+    Build a reader that hands complete stdout lines to `emit` while the
+    command runs, then returns the whole output like `_read_plain`. The
+    first line goes out at once; later ones every `batch_lines` lines or
+    PARTIAL_INTERVAL_SECONDS, whichever comes first, even if no more
+    output follows.
+    """
+
+    def read(stream: IO[bytes]) -> Tuple[str, None]:
+        fd = stream.fileno()
+        data = bytearray()
+        flushed = 0
+        pending_lines = 0
+        last_flush = float("-inf")
+        while True:
+            # Block for output while nothing is held back, otherwise only
+            # until the held lines are due.
+            wait = None
+            if pending_lines:
+                wait = max(0.0, last_flush + PARTIAL_INTERVAL_SECONDS - time.monotonic())
+            if wait is None or select.select([fd], [], [], wait)[0]:
+                chunk = _read_chunk(fd)
+                if not chunk:
+                    break
+                data += chunk
+                pending_lines += chunk.count(b"\n")
+            now = time.monotonic()
+            if pending_lines and (
+                pending_lines >= batch_lines or now - last_flush >= PARTIAL_INTERVAL_SECONDS
+            ):
+                end = data.rindex(b"\n") + 1
+                emit(_decode_output(bytes(data[flushed:end])).rstrip("\n"))
+                flushed = end
+                pending_lines = 0
+                last_flush = now
+        return _decode_output(bytes(data)), None
+
+    return read
+
+
+def _partial_result(
+    command: str,
+    stdout: str,
+    *,
+    category: str,
+    path: Optional[str],
+    note: Optional[str],
+) -> CommandResult:
+    """Build an interim result carrying output seen so far from a running command."""
+    return {
+        "category": category,
+        "command": command,
+        "stdout": stdout,
+        "stderr": "",
+        "returncode": None,
+        "path": path,
+        "note": note,
+        "parsed_sizes": None,
+        "status": "running",
+        "partial": True,
+    }
+
+
+class ScanCancelled(Exception):
+    """Raised inside a scan whose `ScanCancellation` has been cancelled."""
 
 
-def _parse_du_sizes(stdout: str) -> List[Dict[str, Any]]:
+class ScanCancellation:
     """
-    Parse the output of `du -sh` style commands into structured size data.
-    Expected line shape: "<size>\t<path>" or "<size> <path>".
+    Kill switch for the scans run with it via `cached_scan(..., cancel=...)`.
+    Commands those scans start are tracked while they run; `cancel()` kills
+    them, and any later command or directory walk raises ScanCancelled.
     """
-    parsed: List[Dict[str, Any]] = []
-    for line in stdout.splitlines():
-        parts = line.strip().split(None, 1)
-        if len(parts) < 2:
-            continue
-        size_human, path = parts
-        size_bytes = _human_to_bytes(size_human)
-        parsed.append(
-            {
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._procs: Set[subprocess.Popen] = set()
+        self.cancelled = False
+
+    def track(self, proc: subprocess.Popen) -> None:
+        """Register a running command, killing it at once if already cancelled."""
+        with self._lock:
+            if not self.cancelled:
+                self._procs.add(proc)
+                return
+        _kill(proc)
+
+    def untrack(self, proc: subprocess.Popen) -> None:
+        """Forget a command that has exited."""
+        with self._lock:
+            self._procs.discard(proc)
+
+    def cancel(self) -> None:
+        """Kill every tracked command and fail the scans' remaining steps."""
+        with self._lock:
+            self.cancelled = True
+            procs, self._procs = self._procs, set()
+        for proc in procs:
+            _kill(proc)
+
+
+# The cancellation of the scan running on the current thread, set by `cached_scan`.
+_SCAN_CONTEXT = threading.local()
+
+
+def _current_cancellation() -> Optional[ScanCancellation]:
+    """Return the cancellation of the scan running on this thread, if any."""
+    return getattr(_SCAN_CONTEXT, "cancellation", None)
+
+
+def _check_cancelled() -> None:
+    """Raise ScanCancelled when the scan running on this thread has been cancelled."""
+    cancellation = _current_cancellation()
+    if cancellation is not None and cancellation.cancelled:
+        raise ScanCancelled("Scan cancelled.")
+
+
+def _kill(proc: subprocess.Popen) -> None:
+    """Kill `proc`, ignoring one that has already exited."""
+    try:
+        proc.kill()
+    except OSError:
+        pass
+
+
+def _start(
+    args: Union[str, List[str]],
+    *,
+    shell: bool,
+    command: str,
+    category: str,
+    path: Optional[str],
+    note: Optional[str],
+    timeout: Optional[int],
+    reader: Callable[[IO[bytes]], Tuple[str, Optional[SizeColumns]]],
+    discard_stderr: bool = False,
+    tty_stdout: bool = False,
+) -> Callable[[], CommandResult]:
+    """
+    Spawn `args` immediately and return a callable that waits for it and
+    normalizes the outcome into a CommandResult. Stdout and stderr are read
+    on side threads from spawn time, so a command never stalls on a full pipe
+    while an earlier one is being collected, and streaming readers see
+    output as soon as it is written.
+
+    `reader` consumes the child's stdout and returns `(stdout, parsed_sizes)`;
+    entry points pick `_read_plain` or `_read_du` up front so the read loop
+    never branches on the kind of output. `discard_stderr` sends the child's
+    stderr to /dev/null instead of capturing it. `tty_stdout` connects stdout
+    to a pty instead of a pipe: stdio programs such as `find` buffer a pipe
+    in 4 KB blocks but write each line to a terminal, which is what streaming
+    readers need. The child is tracked by the
+    current scan's ScanCancellation, if any, so cancelling the scan kills it.
+    """
+    _check_cancelled()
+    if not shell and not os.path.dirname(args[0]):
+        # CPython only takes its posix_spawn path for executables given with a
+        # directory; a bare name falls back to fork+exec. Unresolvable names
+        # are passed through so Popen reports them as usual.
+        resolved = _which(args[0])
+        if resolved is not None:
+            args = [resolved, *args[1:]]
+    master = slave = None
+    try:
+        if tty_stdout:
+            master, slave = pty.openpty()
+            # Raw mode keeps the terminal from rewriting "\n" as "\r\n".
+            tty.setraw(slave)
+        # close_fds=True rules out CPython's posix_spawn fast path and costs a
+        # full fork of the interpreter on macOS. Leaving it off is safe: Python
+        # creates descriptors non-inheritable (PEP 446), so children still only
+        # see the pipes set up here.
+        proc = subprocess.Popen(
+            args,
+            shell=shell,
+            stdout=subprocess.PIPE if slave is None else slave,
+            stderr=subprocess.DEVNULL if discard_stderr else subprocess.PIPE,
+            close_fds=False,
+        )
+    except Exception as exc:
+        if master is not None:
+            os.close(master)
+        failure = _error_result(command, exc, category=category, path=path, note=note)
+        return lambda: failure
+    finally:
+        if slave is not None:
+            os.close(slave)
+    stdout_stream = proc.stdout if master is None else open(master, "rb", buffering=0)
+
+    cancellation = _current_cancellation()
+    if cancellation is not None:
+        cancellation.track(proc)
+
+    timed_out = threading.Event()
+
+    def expire() -> None:
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, expire) if timeout is not None else None
+    if timer is not None:
+        timer.daemon = True
+        timer.start()
+
+    read_outcome: List[Any] = []
+    stderr_chunks: List[bytes] = []
+
+    def read_stdout() -> None:
+        try:
+            read_outcome.append(reader(stdout_stream))
+        except Exception as exc:
+            read_outcome.append(exc)
+
+    readers = [threading.Thread(target=read_stdout, daemon=True)]
+    if proc.stderr is not None:
+        readers.append(
+            threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True)
+        )
+    for thread in readers:
+        thread.start()
+
+    def finish() -> CommandResult:
+        try:
+            for thread in readers:
+                thread.join()
+            proc.wait()
+            if timer is not None:
+                timer.cancel()
+            if cancellation is not None:
+                cancellation.untrack(proc)
+            if isinstance(read_outcome[0], Exception):
+                raise read_outcome[0]
+            stdout, parsed_sizes = read_outcome[0]
+
+            stdout = stdout.strip()
+            stderr = _decode_output(b"".join(stderr_chunks)).strip()
+            returncode = proc.returncode
+            if timed_out.is_set():
+                stderr = stderr or f"Timed out after {timeout} seconds."
+                returncode = -1
+
+            # Normalize outputs for frontend/CLI consistency.
+            if returncode == 0 and not stdout:
+                stdout = "No files found."
+            if returncode != 0 and not stderr:
+                stderr = "Command failed without additional details."
+
+            return {
+                "category": category,
+                "command": command,
+                "stdout": stdout,
+                "stderr": stderr,
+                "returncode": returncode,
                 "path": path,
-                "size_human": size_human,
-                "size_bytes": size_bytes,
+                "note": note,
+                "parsed_sizes": parsed_sizes,
+                "status": "ok" if returncode == 0 else "error",
             }
-        )
-    return parsed
+        except Exception as exc:
+            return _error_result(command, exc, category=category, path=path, note=note)
+        finally:
+            stdout_stream.close()
+            if proc.stderr is not None:
+                proc.stderr.close()
+
+    return finish
 
 
 def _run_command(
-    command: str,
+    command: Union[str, List[str]],
     *,
     category: str,
     path: Optional[str] = None,
     note: Optional[str] = None,
-    parse_du: bool = False,
     timeout: Optional[int] = DEFAULT_TIMEOUT_SECONDS,
+    discard_stderr: bool = False,
 ) -> CommandResult:
     """
-    Execute a shell command and return a normalized command result dictionary.
+    Execute a command and return a normalized command result dictionary.
 
     Parameters
     ----------
     command:
-        Shell command to execute.
+        Shell command string to run through `/bin/sh`, or an argv list to
+        execute directly without a shell.
     category:
         High-level category name for grouping in the UI.
     path:
         Primary path the command targets, if applicable.
     note:
         Extra context for display purposes.
-    parse_du:
-        When True, attempts to parse `du`-style size output into `parsed_sizes`.
     timeout:
         Soft timeout in seconds for the command; when exceeded, an error result
         is returned with stderr describing the timeout.
+    discard_stderr:
+        Send stderr to /dev/null instead of reporting it (like `2>/dev/null`).
+    """
+    return _start_command(
+        command,
+        category=category,
+        path=path,
+        note=note,
+        timeout=timeout,
+        discard_stderr=discard_stderr,
+    )()
+
+
+def _start_command(
+    command: Union[str, List[str]],
+    *,
+    category: str,
+    path: Optional[str] = None,
+    note: Optional[str] = None,
+    timeout: Optional[int] = DEFAULT_TIMEOUT_SECONDS,
+    on_partial: Optional[Callable[[CommandResult], None]] = None,
+    discard_stderr: bool = False,
+) -> Callable[[], CommandResult]:
+    """
+    Non-blocking form of `_run_command`; call the returned function to collect
+    the result. With `on_partial`, stdout goes through a pty and is also
+    reported in batches as `_partial_result`s while the command runs; the
+    final result still carries the full output.
+    """
+    shell = isinstance(command, str)
+    command_text = command if shell else shlex.join(command)
+    reader = _read_plain
+    if on_partial is not None:
+        reader = _partial_reader(
+            lambda chunk: on_partial(
+                _partial_result(command_text, chunk, category=category, path=path, note=note)
+            )
+        )
+    return _start(
+        command,
+        shell=shell,
+        command=command_text,
+        category=category,
+        path=path,
+        note=note,
+        timeout=timeout,
+        reader=reader,
+        discard_stderr=discard_stderr,
+        tty_stdout=on_partial is not None,
+    )
+
+
+def _start_argv_du(
+    argv: List[str],
+    *,
+    category: str,
+    path: Optional[str] = None,
+    note: Optional[str] = None,
+    timeout: Optional[int] = DEFAULT_TIMEOUT_SECONDS,
+    discard_stderr: bool = False,
+) -> Callable[[], CommandResult]:
+    """Like `_start_command` with an argv list, but always parses `du`-style size output into `parsed_sizes`."""
+    return _start(
+        argv,
+        shell=False,
+        command=shlex.join(argv),
+        category=category,
+        path=path,
+        note=note,
+        timeout=timeout,
+        reader=_read_du,
+        discard_stderr=discard_stderr,
+    )
+
+
+def _start_filtered(
+    argv: List[str],
+    needle: str,
+    *,
+    category: str,
+    path: Optional[str] = None,
+    note: Optional[str] = None,
+    timeout: Optional[int] = DEFAULT_TIMEOUT_SECONDS,
+) -> Callable[[], CommandResult]:
+    """
+    Start `argv` and keep only the stdout lines containing `needle` (case-insensitive).
+    A non-zero exit yields the matches found; a timeout or spawn failure stays an error.
+    """
+    finish = _start_command(
+        argv,
+        category=category,
+        path=path,
+        note=note,
+        timeout=timeout,
+        discard_stderr=True,
+    )
+    needle = needle.lower()
+
+    def collect() -> CommandResult:
+        result = finish()
+        matches = [line for line in result["stdout"].splitlines() if needle in line.lower()]
+        result.update(
+            command=f"{shlex.join(argv)} | grep -i {shlex.quote(needle)}",
+            stdout="\n".join(matches).strip(),
+            parsed_sizes=None,
+        )
+        if result["returncode"] >= 0:
+            result.update(
+                stdout=result["stdout"] or "No files found.",
+                stderr="",
+                returncode=0,
+                status="ok",
+            )
+        return result
+
+    return collect
+
+
+def _start_search(
+    argv: List[str],
+    *,
+    category: str,
+    path: Optional[str] = None,
+    note: Optional[str] = None,
+    on_partial: Optional[Callable[[CommandResult], None]] = None,
+    timeout: Optional[int] = DEFAULT_TIMEOUT_SECONDS,
+) -> Callable[[], CommandResult]:
+    """
+    Start a `find`-style search where unreadable directories are expected:
+    stderr is discarded and a non-zero exit still counts as success, but a timeout does not.
+    """
+    finish = _start_command(
+        argv,
+        category=category,
+        path=path,
+        note=note,
+        timeout=timeout,
+        on_partial=on_partial,
+        discard_stderr=True,
+    )
+
+    def collect() -> CommandResult:
+        result = finish()
+        if result["returncode"] > 0:
+            result.update(
+                stdout=result["stdout"] or "No files found.",
+                stderr="",
+                returncode=0,
+                status="ok",
+            )
+        return result
+
+    return collect
+
+
+def _run_parallel(pending: List[Callable[[], CommandResult]]) -> List[CommandResult]:
+    """
+    Collect already-started commands in order. The `_start_*` helpers spawn
+    their process as soon as they are called, so building `pending` launches
+    every command before this waits on the first one.
+    """
+    return [finish() for finish in pending]
+
+
+def _synthetic_result(
+    command: str,
+    stdout: str,
+    *,
+    category: str,
+    path: Optional[str] = None,
+    note: Optional[str] = None,
+    parsed_sizes: Optional[Union[List[Any], SizeColumns]] = None,
+) -> CommandResult:
+    """Build a successful CommandResult for work done in Python instead of a subprocess."""
+    return {
+        "category": category,
+        "command": command,
+        "stdout": stdout or "No files found.",
+        "stderr": "",
+        "returncode": 0,
+        "path": path,
+        "note": note,
+        "parsed_sizes": parsed_sizes,
+        "status": "ok",
+    }
+
+
+def _size_result(
+    command: str,
+    expanded: str,
+    size_bytes: int,
+    *,
+    category: str,
+    path: Optional[str] = None,
+    note: Optional[str] = None,
+) -> CommandResult:
+    """Synthesize a `du -sh`-shaped result for a size computed without running du."""
+    size_human = _bytes_to_human(size_bytes)
+    parsed = _empty_sizes()
+    _size_appender(parsed)(expanded, size_human, size_bytes)
+    return _synthetic_result(
+        command,
+        f"{size_human}\t{expanded}",
+        category=category,
+        path=path,
+        note=note,
+        parsed_sizes=parsed,
+    )
+
+
+def _start_du_summary(
+    *paths: str,
+    category: str,
+    note: Optional[str] = None,
+) -> Callable[[], CommandResult]:
     """
+    Start `du -sh` over whichever of `paths` exist, skipping the process
+    entirely when none of them do; call the returned function to collect the
+    result. Paths may contain shell-style globs (`~/miniconda*`). The first
+    path is reported as the result's `path`.
+    """
+    expanded = [_expand_user(p) for p in paths]
+    existing: List[str] = []
+    for pattern in expanded:
+        candidates = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        existing.extend(p for p in candidates if os.path.isdir(p))
+    if not existing:
+        skipped = _synthetic_result(
+            shlex.join(["du", "-sh", *expanded]),
+            "No files found.",
+            category=category,
+            path=paths[0],
+            note=note,
+            parsed_sizes=_empty_sizes(),
+        )
+        return lambda: skipped
+
+    finish = _start_argv_du(
+        ["du", "-sh", *existing],
+        category=category,
+        path=paths[0],
+        note=note,
+    )
+
+    def collect() -> CommandResult:
+        result = finish()
+        # du exits 1 when some subdirectories are unreadable but still prints a
+        # total, which is the size this result reports.
+        if result["returncode"] == 1 and result["parsed_sizes"]["paths"]:
+            result["returncode"] = 0
+            result["status"] = "ok"
+        return result
+
+    return collect
+
+
+def _sorted_sizes(parsed: SizeColumns) -> SizeColumns:
+    """Return `parsed` ordered by ascending size; unknown sizes sort first."""
+    sizes = parsed["size_bytes"]
+    order = sorted(range(len(sizes)), key=sizes.__getitem__)
+    ordered = _empty_sizes()
+    append = _size_appender(ordered)
+    for index in order:
+        append(
+            parsed["paths"][index],
+            parsed["size_humans"][index],
+            None if parsed["size_missing"][index] else sizes[index],
+        )
+    return ordered
+
+
+def _start_du_breakdown(
+    path: str,
+    *,
+    category: str,
+    note: Optional[str] = None,
+    timeout: Optional[int] = DEFAULT_TIMEOUT_SECONDS,
+) -> Callable[[], CommandResult]:
+    """
+    Start `du -h -d 1` on `path`; the collected rows are sorted by size, ascending.
+    Unreadable subdirectories (exit status 1) are ignored; a timeout stays an error.
+    """
+    finish = _start_argv_du(
+        ["du", "-h", "-d", "1", _expand_user(path)],
+        category=category,
+        path=path,
+        note=note,
+        timeout=timeout,
+        discard_stderr=True,
+    )
+
+    def collect() -> CommandResult:
+        result = finish()
+        parsed = result["parsed_sizes"]
+        if not parsed or not parsed["paths"]:
+            return result
+        ordered = _sorted_sizes(parsed)
+        result.update(
+            stdout="\n".join(
+                f"{human}\t{row_path}"
+                for human, row_path in zip(ordered["size_humans"], ordered["paths"])
+            ),
+            parsed_sizes=ordered,
+        )
+        if result["returncode"] == 1:
+            result.update(stderr="", returncode=0, status="ok")
+        return result
+
+    return collect
+
+
+def _start_listing(
+    path: str,
+    *,
+    category: str,
+    note: Optional[str] = None,
+    timeout: Optional[int] = DEFAULT_TIMEOUT_SECONDS,
+) -> Callable[[], CommandResult]:
+    """Start `ls -lh` on `path`, or skip the process when `path` does not exist."""
+    expanded = _expand_user(path)
+    argv = ["ls", "-lh", expanded]
+    if not os.path.lexists(expanded):
+        skipped = _synthetic_result(shlex.join(argv), "No files found.", category=category, path=path, note=note)
+        return lambda: skipped
+    return _start_command(argv, category=category, path=path, note=note, timeout=timeout)
+
+
+def _start_tool(
+    argv: List[str],
+    *,
+    category: str,
+    path: Optional[str] = None,
+    note: Optional[str] = None,
+) -> Callable[[], CommandResult]:
+    """Start `argv`, or report '<tool> not installed.' without spawning when it is not on PATH."""
+    if _which(argv[0]) is None:
+        skipped = _synthetic_result(
+            shlex.join(argv),
+            f"{argv[0]} not installed.",
+            category=category,
+            path=path,
+            note=note,
+        )
+        return lambda: skipped
+    return _start_command(argv, category=category, path=path, note=note)
+
+
+def _check_deadline(deadline: Optional[float], timeout: Optional[float]) -> None:
+    """
+    Raise TimeoutError once `deadline` (a `time.monotonic()` value) has passed,
+    or ScanCancelled once the running scan has been cancelled.
+    """
+    _check_cancelled()
+    if deadline is not None and time.monotonic() > deadline:
+        raise TimeoutError(f"Timed out after {timeout} seconds.")
+
+
+def _subtree_sizes(
+    root: str,
+    targets: List[str],
+    timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS,
+) -> Dict[str, int]:
+    """
+    Compute `du`-style allocated sizes (st_blocks * 512) for `root` and any
+    `targets` nested under it in a single walk, so overlapping subtrees are
+    visited once instead of once per target. Symlinks are not followed,
+    hard-linked files are counted once per target, and unreadable directories
+    below `root` are skipped. Raises OSError when `root` itself cannot be
+    listed, since a total of zero would be misleading, and TimeoutError when
+    the walk runs longer than `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    root = os.path.normpath(root)
+    totals = {os.path.normpath(target): 0 for target in targets}
+    totals.setdefault(root, 0)
+    seen_links = set()
+
+    def credit(owners: Tuple[str, ...], st: os.stat_result) -> None:
+        size = st.st_blocks * 512
+        if st.st_nlink > 1 and not stat.S_ISDIR(st.st_mode):
+            # Dedupe per target so each total matches a standalone `du -s`.
+            for owner in owners:
+                key = (owner, st.st_dev, st.st_ino)
+                if key not in seen_links:
+                    seen_links.add(key)
+                    totals[owner] += size
+            return
+        for owner in owners:
+            totals[owner] += size
+
     try:
+        credit((root,), os.lstat(root))
+    except OSError:
+        return totals
+    stack = [(root, (root,))]
+    while stack:
+        _check_deadline(deadline, timeout)
+        directory, owners = stack.pop()
         try:
-            completed = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
+            entries = os.scandir(directory)
+        except OSError:
+            if directory == root:
+                raise
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                entry_owners = owners + (entry.path,) if entry.path in totals else owners
+                credit(entry_owners, st)
+                if stat.S_ISDIR(st.st_mode):
+                    stack.append((entry.path, entry_owners))
+    return totals
+
+
+def _subtree_summaries(
+    targets: List[Tuple[str, str]],
+    *,
+    category: str,
+) -> List[CommandResult]:
+    """
+    Report `du -sh`-shaped summaries for `(path, note)` pairs whose first
+    entry is the root containing all the others, computed with one
+    `_subtree_sizes` walk. Absent paths yield "No files found." results.
+    When the root cannot be listed (e.g. macOS privacy protection), each
+    target falls back to its own `du -sh`, which reports the permission error.
+    """
+    expanded = [os.path.normpath(_expand_user(path)) for path, _ in targets]
+    commands = [f"scandir {shlex.quote(full_path)} (allocated size)" for full_path in expanded]
+    try:
+        sizes = _subtree_sizes(expanded[0], expanded[1:]) if os.path.isdir(expanded[0]) else {}
+    except PermissionError:
+        return _run_parallel(
+            [_start_du_summary(path, category=category, note=note) for path, note in targets]
+        )
+    except TimeoutError:
+        return [
+            _timeout_result(command, DEFAULT_TIMEOUT_SECONDS, category=category, path=path, note=note)
+            for command, (path, note) in zip(commands, targets)
+        ]
+    results = []
+    for (path, note), full_path, command in zip(targets, expanded, commands):
+        if os.path.isdir(full_path):
+            results.append(
+                _size_result(command, full_path, sizes[full_path], category=category, path=path, note=note)
             )
-            stdout = completed.stdout.strip()
-            stderr = completed.stderr.strip()
-            returncode = completed.returncode
-        except subprocess.TimeoutExpired as exc:
-            stdout = (exc.stdout or "").strip()
-            stderr = (exc.stderr or "").strip() or f"Timed out after {timeout} seconds."
-            returncode = -1
-
-        parsed_sizes = _parse_du_sizes(stdout) if parse_du else []
-
-        # Normalize outputs for frontend/CLI consistency.
-        if returncode == 0 and not stdout:
-            stdout = "No files found."
-        if returncode != 0 and not stderr:
-            stderr = "Command failed without additional details."
-
-        return {
-            "category": category,
-            "command": command,
-            "stdout": stdout,
-            "stderr": stderr,
-            "returncode": returncode,
-            "path": path,
-            "note": note,
-            "parsed_sizes": parsed_sizes,
-            "status": "ok" if returncode == 0 else "error",
-        }
-    except Exception as exc:
-        return {
-            "category": category,
-            "command": command,
-            "stdout": "",
-            "stderr": f"Internal execution error: {exc}",
-            "returncode": -1,
-            "path": path,
-            "note": note,
-            "parsed_sizes": None,
-            "status": "error",
-        }
+        else:
+            results.append(
+                _synthetic_result(
+                    command,
+                    "No files found.",
+                    category=category,
+                    path=path,
+                    note=note,
+                    parsed_sizes=_empty_sizes(),
+                )
+            )
+    return results
+
+
+def _bundle_size_from_mdls(path: str) -> Optional[int]:
+    """
+    Read a bundle's allocated size from the Spotlight index via `mdls`.
+    Returns None when Spotlight has no value (`(null)`) or mdls is unavailable.
+    """
+    result = _run_command(
+        ["mdls", "-name", "kMDItemPhysicalSize", "-raw", path],
+        category="mdls",
+        timeout=FAST_TIMEOUT_SECONDS,
+    )
+    value = result["stdout"].strip()
+    if result["returncode"] != 0 or not value.isdigit():
+        return None
+    return int(value)
+
+
+def _start_bundle_summary(
+    path: str,
+    *,
+    category: str,
+    note: Optional[str] = None,
+) -> Callable[[], CommandResult]:
+    """
+    Size `path` from Spotlight's indexed kMDItemPhysicalSize when available,
+    falling back to a `du -sh` walk only when Spotlight has no answer. Only
+    useful for package bundles such as `.photoslibrary`: Spotlight reports
+    null for plain folders, so the `mdls` spawn would be wasted on them.
+    """
+    expanded = _expand_user(path)
+    if os.path.isdir(expanded):
+        size = _bundle_size_from_mdls(expanded)
+        if size is not None:
+            found = _size_result(
+                shlex.join(["mdls", "-name", "kMDItemPhysicalSize", "-raw", expanded]),
+                expanded,
+                size,
+                category=category,
+                path=path,
+                note=note,
+            )
+            return lambda: found
+    return _start_du_summary(path, category=category, note=note)
+
+
+def _find_node_modules(
+    root: str,
+    max_depth: int = 4,
+    timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS,
+) -> List[str]:
+    """
+    Locate `node_modules` directories under `root`, equivalent to
+    `find root -maxdepth N -name node_modules -type d -prune`: matches are not
+    descended into, symlinks are not followed, and unreadable directories are
+    skipped silently. Raises TimeoutError after `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    found: List[str] = []
+    stack = [(root, 1)]
+    while stack:
+        _check_deadline(deadline, timeout)
+        directory, depth = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                subdirs = [entry for entry in entries if entry.is_dir(follow_symlinks=False)]
+        except OSError:
+            continue
+        for entry in subdirs:
+            if entry.name == "node_modules":
+                found.append(entry.path)
+            elif depth < max_depth:
+                stack.append((entry.path, depth + 1))
+    return found
 
 
 def snapshots_search() -> List[CommandResult]:
@@ -171,20 +1146,25 @@ def snapshots_search() -> List[CommandResult]:
     Returns two command results: one listing snapshots and another estimating
     their sizes via `diskutil`.
     """
-    return [
-        _run_command(
-            "tmutil listlocalsnapshots /",
-            category="snapshots",
-            path="/",
-            note="List local APFS snapshots created by Time Machine.",
-        ),
-        _run_command(
-            "diskutil apfs listSnapshots / 2>/dev/null | grep -i size || true",
-            category="snapshots",
-            path="/",
-            note="Estimate snapshot sizes reported by diskutil.",
-        ),
-    ]
+    return _run_parallel(
+        [
+            _start_command(
+                ["tmutil", "listlocalsnapshots", "/"],
+                category="snapshots",
+                path="/",
+                note="List local APFS snapshots created by Time Machine.",
+                timeout=FAST_TIMEOUT_SECONDS,
+            ),
+            _start_filtered(
+                ["diskutil", "apfs", "listSnapshots", "/"],
+                "size",
+                category="snapshots",
+                path="/",
+                note="Estimate snapshot sizes reported by diskutil.",
+                timeout=FAST_TIMEOUT_SECONDS,
+            ),
+        ]
+    )
 
 
 def apfs_search() -> List[CommandResult]:
@@ -194,9 +1174,10 @@ def apfs_search() -> List[CommandResult]:
     """
     return [
         _run_command(
-            "diskutil apfs list",
+            ["diskutil", "apfs", "list"],
             category="apfs",
             note="APFS container and volume breakdown (overhead, purgeable, snapshots).",
+            timeout=FAST_TIMEOUT_SECONDS,
         )
     ]
 
@@ -206,21 +1187,21 @@ def vm_search() -> List[CommandResult]:
     Measure space consumed by virtual memory swap files under /private/var/vm.
     Returns a `du -sh` size summary and a detailed directory listing.
     """
-    return [
-        _run_command(
-            "test -d /private/var/vm && du -sh /private/var/vm || echo 'No files found.'",
-            category="virtual_memory",
-            path="/private/var/vm",
-            note="Overall size of swap files.",
-            parse_du=True,
-        ),
-        _run_command(
-            "ls -lh /private/var/vm 2>/dev/null || echo 'No files found.'",
-            category="virtual_memory",
-            path="/private/var/vm",
-            note="Individual swap files and their sizes.",
-        ),
-    ]
+    return _run_parallel(
+        [
+            _start_du_summary(
+                "/private/var/vm",
+                category="virtual_memory",
+                note="Overall size of swap files.",
+            ),
+            _start_listing(
+                "/private/var/vm",
+                category="virtual_memory",
+                note="Individual swap files and their sizes.",
+                timeout=FAST_TIMEOUT_SECONDS,
+            ),
+        ]
+    )
 
 
 def sleep_search() -> List[CommandResult]:
@@ -229,12 +1210,12 @@ def sleep_search() -> List[CommandResult]:
     Returns the detailed listing for /private/var/vm/sleepimage.
     """
     return [
-        _run_command(
-            "ls -lh /private/var/vm/sleepimage 2>/dev/null || echo 'No files found.'",
+        _start_listing(
+            "/private/var/vm/sleepimage",
             category="sleep",
-            path="/private/var/vm/sleepimage",
             note="Presence and size of the sleepimage file.",
-        )
+            timeout=FAST_TIMEOUT_SECONDS,
+        )()
     ]
 
 
@@ -243,59 +1224,38 @@ def cache_search() -> List[CommandResult]:
     Summarize user and system cache directories that commonly balloon in size.
     Returns `du -sh` summaries for ~/Library/Caches and /Library/Caches.
     """
-    return [
-        _run_command(
-            "test -d ~/Library/Caches && du -sh ~/Library/Caches || echo 'No files found.'",
-            category="caches",
-            path="~/Library/Caches",
-            note="User-level caches (Safari, Chrome, apps).",
-            parse_du=True,
-        ),
-        _run_command(
-            "test -d /Library/Caches && du -sh /Library/Caches || echo 'No files found.'",
-            category="caches",
-            path="/Library/Caches",
-            note="System-level caches.",
-            parse_du=True,
-        ),
-    ]
+    return _run_parallel(
+        [
+            _start_du_summary(
+                "~/Library/Caches",
+                category="caches",
+                note="User-level caches (Safari, Chrome, apps).",
+            ),
+            _start_du_summary(
+                "/Library/Caches",
+                category="caches",
+                note="System-level caches.",
+            ),
+        ]
+    )
 
 
 def dev_data_search() -> List[CommandResult]:
     """
     Capture Xcode and developer tool footprints known to consume tens of GBs.
-    Returns `du -sh` summaries for Developer, DerivedData, CoreSimulator, and Archives.
+    Returns size summaries for Developer, DerivedData, CoreSimulator, and Archives.
+    The three subfolders live inside ~/Library/Developer, so all four sizes come
+    from a single walk of that tree instead of four overlapping `du` runs.
     """
-    return [
-        _run_command(
-            "test -d ~/Library/Developer && du -sh ~/Library/Developer || echo 'No files found.'",
-            category="developer_data",
-            path="~/Library/Developer",
-            note="Aggregate size of all developer data.",
-            parse_du=True,
-        ),
-        _run_command(
-            "test -d ~/Library/Developer/Xcode/DerivedData && du -sh ~/Library/Developer/Xcode/DerivedData || echo 'No files found.'",
-            category="developer_data",
-            path="~/Library/Developer/Xcode/DerivedData",
-            note="Xcode build artifacts (DerivedData).",
-            parse_du=True,
-        ),
-        _run_command(
-            "test -d ~/Library/Developer/CoreSimulator && du -sh ~/Library/Developer/CoreSimulator || echo 'No files found.'",
-            category="developer_data",
-            path="~/Library/Developer/CoreSimulator",
-            note="Simulator device images and data.",
-            parse_du=True,
-        ),
-        _run_command(
-            "test -d ~/Library/Developer/Xcode/Archives && du -sh ~/Library/Developer/Xcode/Archives || echo 'No files found.'",
-            category="developer_data",
-            path="~/Library/Developer/Xcode/Archives",
-            note="Archived Xcode builds.",
-            parse_du=True,
-        ),
-    ]
+    return _subtree_summaries(
+        [
+            ("~/Library/Developer", "Aggregate size of all developer data."),
+            ("~/Library/Developer/Xcode/DerivedData", "Xcode build artifacts (DerivedData)."),
+            ("~/Library/Developer/CoreSimulator", "Simulator device images and data."),
+            ("~/Library/Developer/Xcode/Archives", "Archived Xcode builds."),
+        ],
+        category="developer_data",
+    )
 
 
 def homebrew_search() -> List[CommandResult]:
@@ -303,63 +1263,70 @@ def homebrew_search() -> List[CommandResult]:
     Review Homebrew cache and cellar usage, plus a dry-run cleanup preview.
     Returns a cleanup preview alongside cellar/cache size summaries.
     """
-    return [
-        _run_command(
-            "command -v brew >/dev/null 2>&1 && brew cleanup -n || echo 'brew not installed.'",
-            category="homebrew",
-            note="Preview of files Homebrew can delete (no changes made).",
-        ),
-        _run_command(
-            "du -sh /opt/homebrew/Cellar /usr/local/Cellar 2>/dev/null || echo 'No files found.'",
-            category="homebrew",
-            path="/opt/homebrew/Cellar",
-            note="Installed formulae (Cellar) footprint.",
-            parse_du=True,
-        ),
-        _run_command(
-            "test -d ~/Library/Caches/Homebrew && du -sh ~/Library/Caches/Homebrew || echo 'No files found.'",
-            category="homebrew",
-            path="~/Library/Caches/Homebrew",
-            note="Homebrew download/cache storage.",
-            parse_du=True,
-        ),
-    ]
+    return _run_parallel(
+        [
+            _start_tool(
+                ["brew", "cleanup", "-n"],
+                category="homebrew",
+                note="Preview of files Homebrew can delete (no changes made).",
+            ),
+            _start_du_summary(
+                "/opt/homebrew/Cellar",
+                "/usr/local/Cellar",
+                category="homebrew",
+                note="Installed formulae (Cellar) footprint.",
+            ),
+            # Also inside cache_search's ~/Library/Caches walk, but sized on its
+            # own: sharing that walk would make this scan wait for the whole
+            # cache tree to get a much smaller subtree.
+            _start_du_summary(
+                "~/Library/Caches/Homebrew",
+                category="homebrew",
+                note="Homebrew download/cache storage.",
+            ),
+        ]
+    )
 
 
 def venv_search() -> List[CommandResult]:
     """
     Inspect common package manager caches and virtual environment directories.
     Returns size summaries for npm, pip, conda/anaconda, and Node modules listings.
+    The `node_modules` walk runs in-process while the `du` commands work.
     """
-    return [
-        _run_command(
-            "test -d ~/.npm && du -sh ~/.npm || echo 'No files found.'",
+    pending = [
+        _start_du_summary(
+            "~/.npm",
             category="package_artifacts",
-            path="~/.npm",
             note="npm cache footprint.",
-            parse_du=True,
         ),
-        _run_command(
-            "test -d ~/.cache/pip && du -sh ~/.cache/pip || echo 'No files found.'",
+        _start_du_summary(
+            "~/.cache/pip",
             category="package_artifacts",
-            path="~/.cache/pip",
             note="pip cache footprint.",
-            parse_du=True,
         ),
-        _run_command(
-            "du -sh ~/miniconda* ~/anaconda* 2>/dev/null || echo 'No files found.'",
+        _start_du_summary(
+            "~/miniconda*",
+            "~/anaconda*",
             category="package_artifacts",
-            path="~/miniconda* ~/anaconda*",
             note="Conda/Anaconda installations if present.",
-            parse_du=True,
         ),
-        _run_command(
-            "find ~ -maxdepth 4 -name node_modules -type d -prune 2>/dev/null",
+    ]
+    command = "scandir ~ (maxdepth 4, name node_modules, prune)"
+    note = "Node.js module folders (sizes computed separately if desired)."
+    try:
+        node_modules = _synthetic_result(
+            command,
+            "\n".join(_find_node_modules(_HOME)),
             category="package_artifacts",
             path="~",
-            note="Node.js module folders (sizes computed separately if desired).",
-        ),
-    ]
+            note=note,
+        )
+    except TimeoutError:
+        node_modules = _timeout_result(
+            command, DEFAULT_TIMEOUT_SECONDS, category="package_artifacts", path="~", note=note
+        )
+    return _run_parallel(pending) + [node_modules]
 
 
 def docker_search() -> List[CommandResult]:
@@ -367,20 +1334,20 @@ def docker_search() -> List[CommandResult]:
     Surface Docker disk usage, including the Docker data directory footprint.
     Returns `docker system df` plus a size summary of the Docker containers folder.
     """
-    return [
-        _run_command(
-            "command -v docker >/dev/null 2>&1 && docker system df || echo 'docker not installed.'",
-            category="docker",
-            note="Docker image/container/volume usage summary.",
-        ),
-        _run_command(
-            "du -sh ~/Library/Containers/com.docker.docker 2>/dev/null || echo 'No files found.'",
-            category="docker",
-            path="~/Library/Containers/com.docker.docker",
-            note="Docker for Mac data directory size.",
-            parse_du=True,
-        ),
-    ]
+    return _run_parallel(
+        [
+            _start_tool(
+                ["docker", "system", "df"],
+                category="docker",
+                note="Docker image/container/volume usage summary.",
+            ),
+            _start_du_summary(
+                "~/Library/Containers/com.docker.docker",
+                category="docker",
+                note="Docker for Mac data directory size.",
+            ),
+        ]
+    )
 
 
 def backup_search() -> List[CommandResult]:
@@ -389,29 +1356,26 @@ def backup_search() -> List[CommandResult]:
     Returns a `du -sh` summary for the MobileSync backup directory.
     """
     return [
-        _run_command(
-            "test -d ~/Library/Application\\ Support/MobileSync && du -sh ~/Library/Application\\ Support/MobileSync || echo 'No files found.'",
+        _start_du_summary(
+            "~/Library/Application Support/MobileSync",
             category="backups",
-            path="~/Library/Application Support/MobileSync",
             note="Finder/iTunes device backups.",
-            parse_du=True,
-        )
+        )()
     ]
 
 
 def photo_cache_serch() -> List[CommandResult]:
     """
     Report on Photos library storage, a common hidden consumer of disk space.
-    Returns a `du -sh` summary for the Photos library bundle.
+    Returns a size summary for the Photos library bundle, read from Spotlight
+    when indexed and from `du -sh` otherwise.
     """
     return [
-        _run_command(
-            "test -d ~/Pictures/Photos\\ Library.photoslibrary && du -sh ~/Pictures/Photos\\ Library.photoslibrary || echo 'No files found.'",
+        _start_bundle_summary(
+            "~/Pictures/Photos Library.photoslibrary",
             category="photos",
-            path="~/Pictures/Photos Library.photoslibrary",
             note="Photos library originals and cache size.",
-            parse_du=True,
-        )
+        )()
     ]
 
 
@@ -420,29 +1384,25 @@ def imove_search() -> List[CommandResult]:
     Surface media asset footprints for GarageBand, Logic, and general Movies.
     Returns size summaries for common pro-app and media asset folders.
     """
-    return [
-        _run_command(
-            "test -d /Library/Application\\ Support/GarageBand && du -sh /Library/Application\\ Support/GarageBand || echo 'No files found.'",
-            category="media_assets",
-            path="/Library/Application Support/GarageBand",
-            note="GarageBand loops and sounds.",
-            parse_du=True,
-        ),
-        _run_command(
-            "test -d /Library/Application\\ Support/Logic && du -sh /Library/Application\\ Support/Logic || echo 'No files found.'",
-            category="media_assets",
-            path="/Library/Application Support/Logic",
-            note="Logic Pro content libraries.",
-            parse_du=True,
-        ),
-        _run_command(
-            "test -d ~/Movies && du -sh ~/Movies || echo 'No files found.'",
-            category="media_assets",
-            path="~/Movies",
-            note="User movie files (including iMovie/Final Cut assets).",
-            parse_du=True,
-        ),
-    ]
+    return _run_parallel(
+        [
+            _start_du_summary(
+                "/Library/Application Support/GarageBand",
+                category="media_assets",
+                note="GarageBand loops and sounds.",
+            ),
+            _start_du_summary(
+                "/Library/Application Support/Logic",
+                category="media_assets",
+                note="Logic Pro content libraries.",
+            ),
+            _start_du_summary(
+                "~/Movies",
+                category="media_assets",
+                note="User movie files (including iMovie/Final Cut assets).",
+            ),
+        ]
+    )
 
 
 def purgeable_search() -> List[CommandResult]:
@@ -451,93 +1411,234 @@ def purgeable_search() -> List[CommandResult]:
     Returns the filtered `diskutil info /` output for the Purgeable field.
     """
     return [
-        _run_command(
-            "diskutil info / 2>/dev/null | grep -i Purgeable || true",
+        _start_filtered(
+            ["diskutil", "info", "/"],
+            "Purgeable",
             category="purgeable",
             path="/",
             note="Purgeable storage reported by APFS.",
-        )
+            timeout=FAST_TIMEOUT_SECONDS,
+        )()
     ]
 
 
-def universal_search() -> List[CommandResult]:
+def universal_search(on_partial: Optional[Callable[[CommandResult], None]] = None) -> List[CommandResult]:
     """
     Run broader whole-disk scans to locate large directories or files.
     Combines home-directory breakdown with optional system-wide summaries.
+    Large files found by `find` are passed to `on_partial` as they turn up.
     """
-    return [
-        _run_command(
-            "du -h -d 1 ~ 2>/dev/null | sort -h || echo 'No files found.'",
-            category="universal",
-            path="~",
-            note="Home directory breakdown (sorted ascending).",
-        ),
-        _run_command(
-            "du -h -d 1 / 2>/dev/null | sort -h || echo 'No files found.'",
-            category="universal",
-            path="/",
-            note="Top-level disk breakdown; may need elevated privileges for accuracy.",
-        ),
-        _run_command(
-            "find / -xdev -type f -size +1G -print 2>/dev/null || echo 'No files found.'",
-            category="universal",
-            path="/",
-            note="Files over 1GB (root filesystem, errors suppressed).",
-        ),
-    ]
+    return _run_parallel(
+        [
+            _start_du_breakdown(
+                "~",
+                category="universal",
+                note="Home directory breakdown (sorted ascending).",
+                timeout=DISK_WALK_TIMEOUT_SECONDS,
+            ),
+            _start_du_breakdown(
+                "/",
+                category="universal",
+                note="Top-level disk breakdown; may need elevated privileges for accuracy.",
+                timeout=DISK_WALK_TIMEOUT_SECONDS,
+            ),
+            _start_search(
+                ["find", "/", "-xdev", "-type", "f", "-size", "+1G", "-print"],
+                category="universal",
+                path="/",
+                note="Files over 1GB (root filesystem, errors suppressed).",
+                timeout=DISK_WALK_TIMEOUT_SECONDS,
+                on_partial=on_partial,
+            ),
+        ]
+    )
+
+
+# Ordered scan functions for CLI and server streaming.
+_SCAN_FN_TABLE: Tuple[Callable[..., List[CommandResult]], ...] = (
+    snapshots_search,
+    apfs_search,
+    vm_search,
+    sleep_search,
+    cache_search,
+    dev_data_search,
+    homebrew_search,
+    venv_search,
+    docker_search,
+    backup_search,
+    photo_cache_serch,
+    imove_search,
+    purgeable_search,
+    universal_search,
+)
+# Scan names in the same order, for callers that key on them (server, cache).
+SCAN_FUNCTIONS = [fn.__name__ for fn in _SCAN_FN_TABLE]
+_SCAN_CALLABLES = tuple(zip(SCAN_FUNCTIONS, _SCAN_FN_TABLE))
+
+
+def _scan_error(name: str, stderr: str, note: str) -> CommandResult:
+    """Build the placeholder result used when a scan function cannot run."""
+    return {
+        "category": name,
+        "command": "",
+        "stdout": "",
+        "stderr": stderr,
+        "returncode": -1,
+        "path": None,
+        "note": note,
+        "parsed_sizes": None,
+    }
 
 
-def run_all_scans() -> List[CommandResult]:
+def _cache_connect() -> sqlite3.Connection:
+    """Open the scan cache, creating it on first use."""
+    os.makedirs(os.path.dirname(SCAN_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(SCAN_CACHE_PATH, timeout=5)
+    # WAL lets the server and a CLI run read and write without blocking each other.
+    conn.execute("PRAGMA journal_mode=WAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCAN_CACHE_VERSION:
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS scans")
+            conn.execute(f"PRAGMA user_version = {SCAN_CACHE_VERSION}")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS scans (name TEXT PRIMARY KEY, created REAL NOT NULL, results BLOB NOT NULL)"
+    )
+    return conn
+
+
+def _cache_get(name: str, ttl: float) -> Optional[List[CommandResult]]:
     """
-    Run every scan in order and return a flat list of command results.
-    Each scan failure is captured as an error result rather than raising.
+    Return cached results for scan `name` if stored less than `ttl` seconds
+    ago. Each reused result carries `cached_at` (Unix time it was scanned) so
+    callers can tell it apart from fresh output. A row that no longer decodes
+    is deleted and treated as a miss.
     """
-    results: List[CommandResult] = []
-    for name in SCAN_FUNCTIONS:
-        fn = globals().get(name)
-        if not callable(fn):
-            results.append(
-                {
-                    "category": name,
-                    "command": "",
-                    "stdout": "",
-                    "stderr": f"Scan function {name} is not callable.",
-                    "returncode": -1,
-                    "path": None,
-                    "note": "Internal configuration error.",
-                    "parsed_sizes": None,
-                }
-            )
-            continue
+    try:
+        conn = _cache_connect()
         try:
-            results.extend(fn())
-        except Exception as exc:  # pragma: no cover - defensive
-            results.append(
-                {
-                    "category": name,
-                    "command": "",
-                    "stdout": "",
-                    "stderr": f"Scan function failed: {exc}",
-                    "returncode": -1,
-                    "path": None,
-                    "note": "Scan aborted unexpectedly.",
-                    "parsed_sizes": None,
-                }
-            )
+            row = conn.execute(
+                "SELECT created, results FROM scans WHERE name = ? AND created >= ?",
+                (name, time.time() - ttl),
+            ).fetchone()
+            if row is None:
+                return None
+            created, blob = row
+            try:
+                results = [json.loads(line) for line in blob.splitlines()]
+            except ValueError:
+                with conn:
+                    conn.execute("DELETE FROM scans WHERE name = ?", (name,))
+                return None
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError):
+        return None
+    for result in results:
+        result["cached_at"] = created
+    return results
+
+
+def _cache_put(name: str, results: List[CommandResult]) -> None:
+    """Store results for scan `name`; cache failures never fail the scan."""
+    try:
+        conn = _cache_connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO scans (name, created, results) VALUES (?, ?, ?)",
+                    (name, time.time(), b"\n".join(dumps(result) for result in results)),
+                )
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def _run_cancellable(
+    fn: Callable[[], List[CommandResult]], cancellation: ScanCancellation
+) -> List[CommandResult]:
+    """Call `fn` with `cancellation` as this thread's scan cancellation."""
+    previous = _current_cancellation()
+    _SCAN_CONTEXT.cancellation = cancellation
+    try:
+        return fn()
+    finally:
+        _SCAN_CONTEXT.cancellation = previous
+
+
+def cached_scan(
+    name: str,
+    fn: Callable[..., List[CommandResult]],
+    *,
+    refresh: bool = False,
+    on_partial: Optional[Callable[[CommandResult], None]] = None,
+    cancel: Optional[ScanCancellation] = None,
+) -> List[CommandResult]:
+    """
+    Run scan `fn`, reusing results cached within its SCAN_CACHE_TTL_SECONDS
+    entry unless `refresh` is set. Scans with any failed command are not
+    cached so a timeout is retried on the next request. `on_partial` is
+    forwarded to scans listed in PARTIAL_SCANS; cache hits report no
+    partial output. Commands the scan starts are killed when `cancel` is
+    cancelled, and the scan then raises ScanCancelled or reports errors.
+    """
+    if on_partial is not None and name in PARTIAL_SCANS:
+        fn = partial(fn, on_partial=on_partial)
+    if cancel is not None:
+        fn = partial(_run_cancellable, fn, cancel)
+    ttl = SCAN_CACHE_TTL_SECONDS.get(name)
+    if ttl is None:
+        return fn()
+    if not refresh:
+        cached = _cache_get(name, ttl)
+        if cached is not None:
+            return cached
+    results = fn()
+    if all(result.get("status") != "error" for result in results):
+        _cache_put(name, results)
     return results
 
 
+def _run_scan(name: str, fn: Callable[[], List[CommandResult]], *, refresh: bool = False) -> List[CommandResult]:
+    """Run a single scan function, capturing failures as an error result."""
+    try:
+        return cached_scan(name, fn, refresh=refresh)
+    except Exception as exc:  # pragma: no cover - defensive
+        return [_scan_error(name, f"Scan function failed: {exc}", "Scan aborted unexpectedly.")]
+
+
+def run_all_scans(*, refresh: bool = False) -> List[CommandResult]:
+    """
+    Run every scan concurrently and return a flat list of command results.
+    Results keep the order of SCAN_FUNCTIONS regardless of completion order,
+    and each scan failure is captured as an error result rather than raising.
+    Pass `refresh=True` to ignore cached results.
+    """
+    grouped: List[List[CommandResult]] = [[] for _ in _SCAN_CALLABLES]
+    with ThreadPoolExecutor(max_workers=min(MAX_SCAN_WORKERS, len(_SCAN_CALLABLES))) as executor:
+        pending = {
+            executor.submit(_run_scan, name, fn, refresh=refresh): index
+            for index, (name, fn) in enumerate(_SCAN_CALLABLES)
+        }
+        for future in as_completed(pending):
+            grouped[pending[future]] = future.result()
+    return [result for group in grouped for result in group]
+
+
 def _print_ndjson(results: List[CommandResult]) -> None:
     """Emit results as NDJSON to stdout for CLI usage."""
-    for item in results:
-        sys.stdout.write(json.dumps(item) + "\n")
-        sys.stdout.flush()
+    if not results:
+        return
+    # One buffered write instead of a write+flush syscall pair per line.
+    sys.stdout.flush()
+    sys.stdout.buffer.write(b"\n".join(dumps(item) for item in results) + b"\n")
+    sys.stdout.buffer.flush()
 
 
 if __name__ == "__main__":
     """
-    Running `python bash.py` executes all scans sequentially and prints each
+    Running `python bash.py` executes all scans concurrently and prints each
     command result as an NDJSON line to stdout for quick terminal inspection
-    or piping into other tools.
+    or piping into other tools. Pass `--refresh` to bypass the scan cache.
     """
-    _print_ndjson(run_all_scans())
+    _print_ndjson(run_all_scans(refresh="--refresh" in sys.argv[1:]))
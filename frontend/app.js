@@ -14,6 +14,9 @@
   let abortController = null;
   let isStreaming = false;
   let failureCount = 0;
+  // The first scan may reuse the server's cached results; "Scan Again" asks
+  // for fresh ones so sizes reflect anything just deleted.
+  let hasScanned = false;
   let durationTimer = null;
   const startTimes = new Map();
   const endTimes = new Map();
@@ -95,7 +98,9 @@
     "universal",
   ];
 
-  let activeCategoryIndex = 0;
+  // Scans run concurrently on the server, so results for different
+  // categories arrive interleaved and in completion order.
+  const categoryErrors = new Set();
 
   endpointText.textContent = ENDPOINT;
 
@@ -123,7 +128,7 @@
     activeReader = null;
     isStreaming = false;
     failureCount = 0;
-    activeCategoryIndex = 0;
+    categoryErrors.clear();
     startTimes.clear();
     endTimes.clear();
     stopDurationTicker();
@@ -184,7 +189,21 @@
     streamContainer.querySelector(".placeholder")?.remove();
     streamContainer.append(card);
 
-    const entry = { card, status, progressFill, output, note, header: headerEl, category, scannedCount, timer };
+    // `committed` holds finished command output; `partials` maps a running
+    // command to the output streamed for it so far.
+    const entry = {
+      card,
+      status,
+      progressFill,
+      output,
+      note,
+      header: headerEl,
+      category,
+      scannedCount,
+      timer,
+      committed: "",
+      partials: new Map(),
+    };
     cards.set(key, entry);
     return entry;
   }
@@ -265,23 +284,49 @@
     refreshDurations();
   }
 
+  // The server omits stdout for du-style results and sends only the
+  // column-wise parsed_sizes, so rebuild the "<size>\t<path>" lines.
+  function resultStdout(result) {
+    if (result.stdout) return result.stdout;
+    const parsed = result.parsed_sizes;
+    if (!parsed || !parsed.paths || !parsed.paths.length) return "";
+    return parsed.paths.map((path, i) => `${parsed.size_humans[i]}\t${path}`).join("\n");
+  }
+
+  // Results reused from the server's scan cache carry `cached_at` (seconds).
+  function cachedLabel(result) {
+    if (!result.cached_at) return "";
+    const age = Math.max(0, Date.now() - result.cached_at * 1000);
+    return ` (cached ${formatDuration(age)} ago)`;
+  }
+
+  function renderOutput(entry) {
+    const sections = [entry.committed];
+    entry.partials.forEach((text, command) => sections.push(`${command}\n${text}`.trim()));
+    entry.output.textContent = sections.filter(Boolean).join("\n\n") || "Waiting for output...";
+  }
+
+  function appendPartial(result) {
+    const category = result.category || "generic";
+    if (!startTimes.get(category)) activateCategory(category);
+    const entry = ensureCard(category);
+    entry.note.textContent = result.note || entry.note.textContent;
+    const previous = entry.partials.get(result.command);
+    entry.partials.set(result.command, previous ? `${previous}\n${result.stdout}` : result.stdout);
+    renderOutput(entry);
+  }
+
   function updateCard(result) {
+    // Partial output from a command that is still running; its final result
+    // replaces it and is what counts towards progress.
+    if (result.partial) return appendPartial(result);
     const category = result.category || "generic";
     if (!categoryTotals.has(category)) {
       categoryTotals.set(category, 1);
       categoryCompleted.set(category, 0);
     }
 
-    // Check for category transition (if we received a result for a later category)
-    const resultIndex = categoryOrder.indexOf(category);
-    if (resultIndex > -1 && resultIndex > activeCategoryIndex) {
-        // Fast-forward: finish any pending categories between active and this one
-        for (let i = activeCategoryIndex; i < resultIndex; i++) {
-            finishCategory(categoryOrder[i], false); 
-        }
-        activeCategoryIndex = resultIndex;
-        activateCategory(category);
-    } else if (resultIndex === -1 && !startTimes.get(category)) {
+    if (!startTimes.get(category)) {
         // Fallback for unknown categories
         activateCategory(category);
     }
@@ -289,11 +334,12 @@
     const entry = ensureCard(category);
     const summary = ensureSummary(category);
 
-    entry.note.textContent = result.note || entry.note.textContent;
+    entry.note.textContent = result.note ? `${result.note}${cachedLabel(result)}` : entry.note.textContent;
 
-    const combined = [result.command, result.stdout, result.stderr].filter(Boolean).join("\n").trim();
-    const existing = entry.output.textContent.replace("Waiting for output...", "").trim();
-    entry.output.textContent = `${existing ? existing + "\n\n" : ""}${combined || "(no output)"}`;
+    const combined = [result.command, resultStdout(result), result.stderr].filter(Boolean).join("\n").trim();
+    entry.partials.delete(result.command);
+    entry.committed = `${entry.committed ? entry.committed + "\n\n" : ""}${combined || "(no output)"}`;
+    renderOutput(entry);
     entry.progressFill.classList.remove("indeterminate");
 
     const total = categoryTotals.get(category) || 1;
@@ -302,7 +348,10 @@
     entry.progressFill.style.width = `${Math.min(100, (doneNext / total) * 100)}%`;
 
     const isError = !(result.status === "ok" || result.returncode === 0);
-    if (isError) failureCount += 1;
+    if (isError) {
+      failureCount += 1;
+      categoryErrors.add(category);
+    }
 
     categoryCompleted.set(category, doneNext);
     summary.counts.textContent = `${doneNext} / ${total}`;
@@ -310,13 +359,7 @@
 
     // Completion check
     if (doneNext >= total) {
-        finishCategory(category, isError);
-        // Automatically start the next one
-        const nextIndex = categoryOrder.indexOf(category) + 1;
-        if (nextIndex < categoryOrder.length) {
-            activeCategoryIndex = nextIndex;
-            activateCategory(categoryOrder[nextIndex]);
-        }
+        finishCategory(category, categoryErrors.has(category));
     } else if (isError) {
         entry.status.classList.add("error");
         entry.status.textContent = "Error";
@@ -382,11 +425,8 @@
     if (isStreaming) return;
     resetStream();
     startDurationTicker();
-    // Activate the first category immediately
-    if (categoryOrder.length > 0) {
-        activeCategoryIndex = 0;
-        activateCategory(categoryOrder[0]);
-    }
+    // Every category starts at once because the server runs scans concurrently
+    categoryOrder.forEach((category) => activateCategory(category));
 
     setStatus("Connecting...");
     abortController = new AbortController();
@@ -394,7 +434,9 @@
     toggleButtons(true, false);
 
     try {
-      const response = await fetch(ENDPOINT, { signal: abortController.signal });
+      const url = hasScanned ? `${ENDPOINT}?refresh=1` : ENDPOINT;
+      hasScanned = true;
+      const response = await fetch(url, { signal: abortController.signal });
       if (!response || !response.body) throw new Error("No response body to stream.");
       setStatus("Streaming data...");
       await handleStream(response.body);
@@ -472,11 +514,10 @@
     if (hasFailures) setStatus(`Completed with ${failureCount} error(s)`, "error");
     else setStatus("All categories finished", "success");
     
-    // Ensure the last active category is marked finished if stream ended
-    const currentCat = categoryOrder[activeCategoryIndex];
-    if (currentCat && !endTimes.has(currentCat)) {
-        finishCategory(currentCat, false);
-    }
+    // Ensure any category still running is marked finished if stream ended
+    startTimes.forEach((_, category) => {
+      if (!endTimes.has(category)) finishCategory(category, categoryErrors.has(category));
+    });
   }
 
   function updateProgress() {}
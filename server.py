@@ -4,42 +4,220 @@ Simple streaming HTTP server that exposes scan results for the frontend.
 Endpoints:
     GET /                 - Serves the frontend (index.html) from ./frontend
     GET /api/scan/stream  - Streams NDJSON of all scan results as they complete
+                            (scans run concurrently; results arrive in
+                            completion order; add ?refresh=1 to bypass
+                            the scan cache). Clients connecting while a
+                            scan is running share it instead of starting
+                            another, unless they ask for ?refresh=1 and
+                            that scan may serve cached results.
 """
 
 from __future__ import annotations
 
 import argparse
-import json
 import os
+import queue
 import threading
+from functools import partial
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
-from typing import Iterable
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
 
 import bash
 
-SCAN_FUNCS = [getattr(bash, name) for name in bash.SCAN_FUNCTIONS]
+SCAN_FUNCS: Tuple[Tuple[str, Callable[..., List[dict]]], ...] = tuple(
+    (name, getattr(bash, name)) for name in bash.SCAN_FUNCTIONS
+)
 
 
-def iter_scan_results() -> Iterable[dict]:
-    """Yield command results from each scan function sequentially."""
-    for fn in SCAN_FUNCS:
+def _scan_failure(name: str, exc: Exception) -> List[dict]:
+    """Build the results reported for a scan function that raised."""
+    return [
+        {
+            "category": name,
+            "command": "",
+            "stdout": "",
+            "stderr": f"Scan function failed: {exc}",
+            "returncode": -1,
+            "path": None,
+            "note": "Internal scan error.",
+            "parsed_sizes": None,
+        }
+    ]
+
+
+def _run_scan_into(
+    updates: queue.Queue,
+    name: str,
+    fn: Callable[..., List[dict]],
+    refresh: bool,
+    cancel: bash.ScanCancellation,
+) -> None:
+    """Run one scan, pushing its partial results and then its final result list onto `updates`."""
+    try:
+        results = bash.cached_scan(name, fn, refresh=refresh, on_partial=updates.put, cancel=cancel)
+    except Exception as exc:  # pragma: no cover - defensive
+        results = _scan_failure(name, exc)
+    updates.put(results)
+
+
+def iter_scan_batches(
+    refresh: bool = False, cancel: Optional[bash.ScanCancellation] = None
+) -> Iterable[List[dict]]:
+    """
+    Run every scan function concurrently and yield command results as each
+    scan finishes, so fast scans are not held back by slow ones. Slow scans
+    are served from the on-disk cache unless `refresh` is set. Partial
+    results (`"partial": true`) from long-running commands are yielded as they
+    arrive, ahead of their scan's final results.
+
+    Each batch holds everything ready at that moment (at least one scan's
+    results or one partial update), so callers can write it in one go.
+    Commands still running are killed through `cancel` (or a private
+    cancellation) when the generator is closed early.
+    """
+    if cancel is None:
+        cancel = bash.ScanCancellation()
+    # Partial results arrive as single dicts, finished scans as result lists.
+    # Scans run on daemon threads so a stopping server never waits for them.
+    updates: queue.Queue = queue.Queue()
+    for name, fn in SCAN_FUNCS:
+        threading.Thread(
+            target=_run_scan_into, args=(updates, name, fn, refresh, cancel), daemon=True
+        ).start()
+
+    remaining = len(SCAN_FUNCS)
+    try:
+        while remaining:
+            batch: List[dict] = []
+            item = updates.get()
+            while True:
+                if isinstance(item, list):
+                    remaining -= 1
+                    batch.extend(item)
+                else:
+                    batch.append(item)
+                if not remaining:
+                    break
+                try:
+                    item = updates.get_nowait()
+                except queue.Empty:
+                    break
+            yield batch
+    finally:
+        if remaining:
+            # A disconnected client closed this generator early; stop the
+            # `du`/`find` walks instead of letting them run to their timeouts.
+            cancel.cancel()
+
+
+def _wire_result(result: dict) -> dict:
+    """
+    Drop `stdout` from results whose output is fully captured by their
+    `parsed_sizes` rows; the frontend rebuilds the `<size>\t<path>` lines
+    from the columns, so sending both would double the payload.
+    """
+    parsed = result.get("parsed_sizes")
+    if parsed and parsed["paths"]:
+        return {**result, "stdout": ""}
+    return result
+
+
+def _server_error(exc: Exception) -> dict:
+    """Build the result reported when streaming itself fails."""
+    return {
+        "category": "server",
+        "command": "",
+        "stdout": "",
+        "stderr": f"Server error: {exc}",
+        "returncode": -1,
+        "path": None,
+        "note": "Streaming aborted.",
+        "parsed_sizes": None,
+    }
+
+
+class _ScanRun:
+    """One in-flight scan: encoded NDJSON chunks so far, who is reading them, and its kill switch."""
+
+    def __init__(self, refresh: bool) -> None:
+        self.refresh = refresh
+        self.chunks: List[bytes] = []
+        self.done = False
+        self.subscribers = 0
+        self.cancel = bash.ScanCancellation()
+
+
+class ScanBroadcast:
+    """
+    Share one in-flight scan between every client streaming at the same time.
+    The first subscriber starts the scan on a background thread; later ones
+    replay the chunks sent so far and then follow along. Each batch is encoded
+    once for all subscribers. When the last subscriber leaves, the scan's
+    commands are killed and the next subscriber starts a fresh one.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._run: Optional[_ScanRun] = None
+
+    def subscribe(self, refresh: bool = False) -> Iterator[bytes]:
+        """
+        Yield encoded NDJSON chunks for the current scan, starting one if none
+        is running. A `refresh` subscriber only joins a run that is itself
+        bypassing the cache; otherwise it starts a fresh run, which later
+        subscribers then share. Clients of the replaced run keep following it.
+        """
+        with self._cond:
+            run = self._run
+            if run is None or (refresh and not run.refresh):
+                run = self._run = _ScanRun(refresh)
+                threading.Thread(target=self._produce, args=(run,), daemon=True).start()
+            run.subscribers += 1
+        sent = 0
         try:
-            results = fn()
-        except Exception as exc:  # pragma: no cover - defensive
-            yield {
-                "category": getattr(fn, "__name__", "scan"),
-                "command": "",
-                "stdout": "",
-                "stderr": f"Scan function failed: {exc}",
-                "returncode": -1,
-                "path": None,
-                "note": "Internal scan error.",
-                "parsed_sizes": None,
-            }
-            continue
-
-        for result in results:
-            yield result
+            while True:
+                with self._cond:
+                    while sent == len(run.chunks) and not run.done:
+                        self._cond.wait()
+                    pending = run.chunks[sent:]
+                    finished = run.done
+                sent += len(pending)
+                yield from pending
+                if finished:
+                    return
+        finally:
+            with self._cond:
+                run.subscribers -= 1
+                if run.subscribers == 0 and not run.done:
+                    run.cancel.cancel()
+                    if self._run is run:
+                        self._run = None
+
+    def _produce(self, run: _ScanRun) -> None:
+        """Drive one scan, publishing each batch to `run`'s subscribers."""
+        batches = iter_scan_batches(run.refresh, run.cancel)
+        try:
+            for batch in batches:
+                chunk = b"".join(bash.dumps(_wire_result(result)) + b"\n" for result in batch)
+                with self._cond:
+                    run.chunks.append(chunk)
+                    self._cond.notify_all()
+                    if run.subscribers == 0:
+                        break
+        except Exception as exc:  # pragma: no cover - runtime guardrail
+            with self._cond:
+                run.chunks.append(bash.dumps(_server_error(exc)) + b"\n")
+        finally:
+            batches.close()
+            with self._cond:
+                run.done = True
+                if self._run is run:
+                    self._run = None
+                self._cond.notify_all()
+
+
+SCAN_BROADCAST = ScanBroadcast()
 
 
 class StreamingHandler(SimpleHTTPRequestHandler):
@@ -48,11 +226,13 @@ class StreamingHandler(SimpleHTTPRequestHandler):
     protocol_version = "HTTP/1.1"
 
     def do_GET(self):  # noqa: N802 - required by BaseHTTPRequestHandler
-        if self.path.rstrip("/") == "/api/scan/stream":
-            return self.handle_stream()
+        url = urlsplit(self.path)
+        if url.path.rstrip("/") == "/api/scan/stream":
+            refresh = parse_qs(url.query).get("refresh", [""])[0] not in ("", "0")
+            return self.handle_stream(refresh=refresh)
         return super().do_GET()
 
-    def handle_stream(self) -> None:
+    def handle_stream(self, refresh: bool = False) -> None:
         """Stream NDJSON scan results to the client."""
         self.send_response(200)
         self.send_header("Content-Type", "application/x-ndjson")
@@ -62,40 +242,29 @@ class StreamingHandler(SimpleHTTPRequestHandler):
         self.send_header("Transfer-Encoding", "chunked")
         self.end_headers()
 
-        def send_chunk(data: str) -> None:
-            encoded = data.encode("utf-8")
-            self.wfile.write(f"{len(encoded):X}\r\n".encode("utf-8"))
-            self.wfile.write(encoded)
-            self.wfile.write(b"\r\n")
+        def send_chunk(encoded: bytes) -> None:
+            # wfile is unbuffered, so frame the chunk and send it in one write.
+            self.wfile.write(b"%X\r\n%s\r\n" % (len(encoded), encoded))
             self.wfile.flush()
 
+        chunks = SCAN_BROADCAST.subscribe(refresh)
         try:
-            for result in iter_scan_results():
-                send_chunk(json.dumps(result) + "\n")
+            for chunk in chunks:
+                send_chunk(chunk)
             self.wfile.write(b"0\r\n\r\n")
             self.wfile.flush()
         except BrokenPipeError:
             pass
         except Exception as exc:  # pragma: no cover - runtime guardrail
             try:
-                send_chunk(
-                    json.dumps(
-                        {
-                            "category": "server",
-                            "command": "",
-                            "stdout": "",
-                            "stderr": f"Server error: {exc}",
-                            "returncode": -1,
-                            "path": None,
-                            "note": "Streaming aborted.",
-                            "parsed_sizes": None,
-                        }
-                    )
-                )
+                send_chunk(bash.dumps(_server_error(exc)) + b"\n")
                 self.wfile.write(b"0\r\n\r\n")
                 self.wfile.flush()
             except Exception:
                 pass
+        finally:
+            # Unsubscribe now rather than whenever the generator is collected.
+            chunks.close()
 
     def log_message(self, fmt: str, *args) -> None:
         """Silence default request logs to keep console tidy."""
@@ -117,9 +286,7 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    handler = lambda *handler_args, **handler_kwargs: StreamingHandler(  # noqa: E731
-        *handler_args, directory=args.directory, **handler_kwargs
-    )
+    handler = partial(StreamingHandler, directory=args.directory)
 
     server = ThreadingHTTPServer((args.host, args.port), handler)
     print(